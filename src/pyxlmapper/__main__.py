@@ -38,37 +38,41 @@ parser.add_argument(
 )
 parser.add_argument("-o", "--out", required=False, help="Output file")
 
-args = parser.parse_args()
 
-wb = openpyxl.open(args.filename, data_only=True)
-
-if args.sheet is not None:
-    ws = wb[args.sheet]
-elif len(wb.sheetnames) == 1:
-    ws = wb.active
-else:
+def get_formatter(tree: MapperNode, output_type: str) -> Formatter:
+    match output_type:
+        case "mapper":
+            return MapperFormatter(tree)
+        case "ts":
+            return TypescriptFormatter(tree)
     raise ValueError
 
 
-offset = (args.v_offset, args.h_offset)
+def main():
+    args = parser.parse_args()
 
-mapper = infer(ws, height=args.height, offset=offset, name=args.name or "Mapper")
+    # Links are never used for header inference, skip reading them
+    wb = openpyxl.open(args.filename, data_only=True, keep_links=False)
 
+    if args.sheet is not None:
+        ws = wb[args.sheet]
+    elif len(wb.sheetnames) == 1:
+        ws = wb.active
+    else:
+        raise ValueError
 
-def get_formatter(tree: MapperNode) -> Formatter:
-    match args.type:
-        case "mapper":
-            return MapperFormatter(tree)
-        case "ts":
-            return TypescriptFormatter(tree)
-    raise ValueError
+    offset = (args.v_offset, args.h_offset)
+
+    mapper = infer(ws, height=args.height, offset=offset, name=args.name or "Mapper")
 
+    formatter = get_formatter(mapper.root, args.type)
 
-formatter = get_formatter(mapper.root)
+    if args.out is not None:
+        with open(args.out, "w") as fd:
+            fd.write(str(formatter))
+    else:
+        print(formatter)
 
 
-if args.out is not None:
-    with open(args.out, "w") as fd:
-        fd.write(str(formatter))
-else:
-    print(formatter)
+if __name__ == "__main__":
+    main()
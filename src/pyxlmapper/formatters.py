@@ -1,6 +1,7 @@
 from __future__ import annotations
 from abc import abstractmethod, ABC
-from typing import TYPE_CHECKING, List
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List
 
 from pyxlmapper.util import class_name_from_str
 
@@ -54,30 +55,42 @@ class MapperFormatter(Formatter, StyledCode):
 
     # @override
     def format(self):
+        parts: List[str] = [self.preamble]
+        stack = [(self.tree, 0)]
+        while stack:
+            node, level = stack.pop()
+            parts.append(self._format(node, level))
+            stack.extend((d, level + 1) for d in reversed(node.children))
+
         # [:-1] to remove 1 unnecessary blank line at the end
-        return self.preamble + self._format(self.tree, 0)[:-1]
+        return "".join(parts)[:-1]
 
     def _format(self, node: MapperNode, level: int):
+        """
+        Format a single class definition (without nested classes)
+        """
         parents = f"(SpreadsheetMapper)" if level == 0 else ""
         class_def = f"{self.pad(level)}class {class_name_from_str(node.config.raw_name)}{parents}:"
-        details = ""
-
-        children = "".join([self._format(d, level + 1) for d in node.children])
+        detail_parts: List[str] = []
+        config = node.config
+        overrides = config._overrides
+        padding = self.pad(level + 1)
 
-        for field in node.config._own_fields:
+        for field in config._own_fields:
             # Skip fields that are not overriden
-            if field not in node.config._overrides:
+            if field not in overrides:
                 continue
-            value = getattr(node.config, field)
-            str_repr = f'"{value}"' if type(value) == str else value
-            details += f"{self.pad(level + 1)}{field} = {str_repr}\n"
+            value = getattr(config, field)
+            str_repr = f'"{value}"' if isinstance(value, str) else value
+            detail_parts.append(f"{padding}{field} = {str_repr}\n")
 
-        if len(node.config._overrides) == 0 and len(node.children) == 0:
-            details += f"{self.pad(level + 1)}pass\n"
+        if len(overrides) == 0 and len(node.children) == 0:
+            detail_parts.append(f"{padding}pass\n")
 
+        details = "".join(detail_parts)
         line_skip = "\n" if details != "" else ""
 
-        return f"{class_def}\n{details}{line_skip}{children}"
+        return f"{class_def}\n{details}{line_skip}"
 
 
 class TypescriptFormatter(Formatter, StyledCode):
@@ -89,42 +102,59 @@ class TypescriptFormatter(Formatter, StyledCode):
     spaces = 2
 
     def format(self):
-        aliases = dict()  # set of used typenames to avoid duplications
+        # Keyed by node identity: qualified names are not unique when
+        # the same header repeats among siblings
+        aliases: Dict[int, str] = dict()  # id(node) -> typename
+        used_typenames = set()  # set of used typenames to avoid duplications
+        alias_counter: Counter[str] = Counter()  # last number used per alias
         typedefs: List[str] = [self.preamble]
 
         # TODO move this aliases thing to a separate method
         # Get all type names in root -> leaf order. Create aliases for duplicates
-        for node in filter(lambda d: not d.is_leaf, self.tree):
+        nonleaf_nodes = [d for d in self.tree if not d.is_leaf]
+
+        for node in nonleaf_nodes:
             typename = class_name_from_str(node.config.raw_name)
-            if typename not in aliases.values():
+            if typename not in used_typenames:
                 # Add type name normally
-                aliases[node.qualified_name] = typename
+                aliases[id(node)] = typename
+                used_typenames.add(typename)
                 continue
 
             # Name is already take, alias is needed
             if node.parent is not None:
-                parent_alias = aliases[node.parent.qualified_name]
+                parent_alias = aliases[id(node.parent)]
             else:
                 parent_alias = "Root"
 
             alias = parent_alias + typename
-            aliases[node.qualified_name] = alias
+
+            # Prefixed name might be taken as well, number it then
+            if alias in used_typenames:
+                prefixed = alias
+                while alias in used_typenames:
+                    alias_counter[prefixed] += 1
+                    alias = f"{prefixed}{alias_counter[prefixed]}"
+
+            aliases[id(node)] = alias
+            used_typenames.add(alias)
 
         # Going in reversed order here
-        for node in reversed(list(filter(lambda d: not d.is_leaf, self.tree))):
-            typename = aliases[node.qualified_name]
-            typedef = f"export type {typename} = {{\n"
+        for node in reversed(nonleaf_nodes):
+            typename = aliases[id(node)]
+            lines = [f"export type {typename} = {{"]
 
             for child in node.children:
+                comment = ""
                 if "input_name" in child.config._overrides:
-                    typedef += f"{self.pad(1)}/** {child.config.input_name} */"
-                child_type = (
-                    "string" if child.is_leaf else aliases[child.qualified_name]
+                    comment = f"{self.pad(1)}/** {child.config.input_name} */"
+                child_type = "string" if child.is_leaf else aliases[id(child)]
+                lines.append(
+                    f"{comment}{self.pad(1)}{child.config.output_name}: {child_type};"
                 )
-                typedef += f"{self.pad(1)}{child.config.output_name}: {child_type};\n"
 
-            typedef += "}\n"
-            typedefs.append(typedef)
+            lines.append("}\n")
+            typedefs.append("\n".join(lines))
 
         return "\n".join(typedefs)
 
@@ -143,17 +173,17 @@ class PrettyFormatter(Formatter):
     """
 
     def format(self):
-        # Remove extra \n with [:-1]
-        return self._format(self.tree, 0)[:-1]
-
-    def _format(self, node: MapperNode, level: int):
-        padding = "  " * level
-        header = f"{padding}{node}"
-        details = ""
-        if node.config.offset != (0, 0):
-            details = f"{padding}  ++ offset={node.config.offset}\n"
-        children = "".join([self._format(d, level + 1) for d in node.children])
-        return f"{header}\n{details}{children}"
+        lines: List[str] = []
+        stack = [(self.tree, 0)]
+        while stack:
+            node, level = stack.pop()
+            padding = "  " * level
+            lines.append(f"{padding}{node}")
+            if node.config.offset != (0, 0):
+                lines.append(f"{padding}  ++ offset={node.config.offset}")
+            stack.extend((d, level + 1) for d in reversed(node.children))
+
+        return "\n".join(lines)
 
 
 class FlatFormatter(Formatter):
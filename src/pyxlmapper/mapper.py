@@ -1,8 +1,8 @@
-from functools import cached_property
-from itertools import chain
+from itertools import groupby
 import sys
 from typing import (
     Any,
+    Callable,
     ClassVar,
     Generator,
     Iterable,
@@ -19,15 +19,15 @@ from dataclasses import dataclass, field
 
 from pyxlmapper.formatters import PrettyFormatter
 from pyxlmapper.util import (
+    cached_property,
     camel_to_snake,
     class_name_from_str,
-    dict_path_set,
     normalize,
-    unwrap,
+    read_values,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class InternalConfig:
     """
     Main config container class
@@ -85,16 +85,30 @@ class InternalConfig:
         """
         nodedef is not really 'NodeConfig', but it has matching properties
         """
-        name = nodeconf.__name__
+        name = sys.intern(nodeconf.__name__)
+
+        # Collect class attributes once (inherited ones included)
+        attrs = {}
+        for klass in reversed(nodeconf.__mro__):
+            attrs.update(vars(klass))
+
         # Set fields
-        input_name = getattr(nodeconf, "input_name", name)
-        output_name = getattr(nodeconf, "output_name", camel_to_snake(name))
-        offset = getattr(nodeconf, "offset", (0, 0))
-        optional = getattr(nodeconf, "optional", False)
-        skip = getattr(nodeconf, "optional", False)
+        # Only strings can be interned, `input_name` may be e.g. a numeric header
+        input_name = attrs.get("input_name", name)
+        if isinstance(input_name, str):
+            input_name = sys.intern(input_name)
+        if "output_name" in attrs:
+            output_name = attrs["output_name"]
+            if isinstance(output_name, str):
+                output_name = sys.intern(output_name)
+        else:
+            output_name = sys.intern(camel_to_snake(name))
+        offset = attrs.get("offset", (0, 0))
+        optional = attrs.get("optional", False)
+        skip = attrs.get("skip", False)
 
         # Set metadata
-        overrides = set([d for d in cls._own_fields if hasattr(nodeconf, d)])
+        overrides = {d for d in cls._own_fields if d in attrs}
 
         return cls(
             raw_name=name,
@@ -111,8 +125,10 @@ class InternalConfig:
         """
         Build config for given header name
         """
-        raw_name = class_name_from_str(input_name)
-        output_name = camel_to_snake(raw_name)
+        # Header names repeat a lot, interning makes equality checks cheap
+        input_name = sys.intern(input_name)
+        raw_name = sys.intern(class_name_from_str(input_name))
+        output_name = sys.intern(camel_to_snake(raw_name))
 
         overrides = set()
 
@@ -141,7 +157,7 @@ class InternalConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MapperNode:
     """
     Bi-directional tree
@@ -150,6 +166,41 @@ class MapperNode:
     config: InternalConfig
     parent: Optional[Self] = None
     children: List[Self] = field(default_factory=list)
+    _child_index: int = field(default=-1, init=False, repr=False, compare=False)
+    """
+    Position among parent's children (maintained by `add_child`/`remove_child`)
+    """
+    _rightmost: Optional[Self] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    """
+    Rightmost leaf of the subtree (maintained by `add_child`/`remove_child`)
+    """
+
+    # Slots for the cached properties below, unset until first computed
+    _abs_pos: Tuple[int, int] = field(init=False, repr=False, compare=False)
+    _path_from_root: Tuple[Self, ...] = field(init=False, repr=False, compare=False)
+    _output_path: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _qualified_name: str = field(init=False, repr=False, compare=False)
+    _cardinality: int = field(init=False, repr=False, compare=False)
+
+    _cached_properties: ClassVar[Iterable[str]] = (
+        "abs_pos",
+        "path_from_root",
+        "output_path",
+        "qualified_name",
+    )
+    """
+    Derived values that depend on the tree layout (see `clear_caches`)
+    """
+    _subtree_properties: ClassVar[Iterable[str]] = ("cardinality",)
+    """
+    Derived values that depend on the subtree. Dropped for all ancestors
+    when a child is added or removed
+    """
+
+    def __post_init__(self):
+        self._rightmost = self
 
     @classmethod
     def from_config(cls, config: type):
@@ -160,44 +211,28 @@ class MapperNode:
     def infer(cls, internal_config: InternalConfig):
         return cls(config=internal_config)
 
-    @cached_property
-    def column_pos(self):
-        if self.parent is None:
-            return self.config.offset[1] + 1
-
-        def index_of(lst, item):
-            for idx, d in enumerate(lst):
-                if d == item:
-                    return idx
-            return -1
-
-        pos = index_of(self.parent.children, self)
-
-        if pos > 0:
-            sibling = self.parent.children[pos - 1]
-        else:
-            sibling = None
-
-        previous_node_pos = (
-            sibling.last.abs_pos[1]
-            if sibling is not None
-            else self.parent.abs_pos[1] - 1
-        )
-
-        return previous_node_pos + self.config.offset[1] + 1
+    @property
+    def column_pos(self) -> int:
+        return self.abs_pos[1]
 
     @cached_property
     def abs_pos(self) -> Tuple[int, int]:
         """
         Absolute position in spreadsheet coordinate space
         """
+        row_offset, col_offset = self.config.offset
         if self.parent is None:
-            return (self.config.offset[0], self.column_pos)
+            return (row_offset, col_offset + 1)
 
-        return (
-            self.parent.abs_pos[0] + self.config.offset[0] + 1,
-            self.column_pos,
-        )
+        parent_row, parent_col = self.parent.abs_pos
+        if self._child_index > 0:
+            # Right after the rightmost leaf of the previous sibling
+            sibling = self.parent.children[self._child_index - 1]
+            previous_col = sibling.last.abs_pos[1]
+        else:
+            previous_col = parent_col - 1
+
+        return (parent_row + row_offset + 1, previous_col + col_offset + 1)
 
     @property
     def is_root(self):
@@ -208,14 +243,11 @@ class MapperNode:
         return len(self.children) == 0
 
     @property
-    def last(self):
+    def last(self) -> Self:
         """
         rightmost child node
         """
-        if len(self.children) > 0:
-            return self.children[-1].last
-        else:
-            return self
+        return self._rightmost
 
     @property
     def root(self):
@@ -224,57 +256,110 @@ class MapperNode:
             node = node.parent
         return node
 
-    @property
+    @cached_property
+    def path_from_root(self) -> Tuple[Self, ...]:
+        """
+        Nodes from the root down to this node (inclusive)
+        """
+        path: List[Self] = []
+        node = self
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+        return tuple(path)
+
+    @cached_property
+    def output_path(self) -> Tuple[str, ...]:
+        """
+        Output names from the root down to this node (root excluded)
+        """
+        return tuple(d.config.output_name for d in self.path_from_root[1:])
+
+    @cached_property
     def qualified_name(self):
-        path = self.get_path()
-        names = map(lambda d: d.config.output_name, path[1:])
-        return ".".join(names)
+        return ".".join(self.output_path)
 
-    @property
+    @cached_property
     def cardinality(self):
-        return len(self.children) + sum(d.cardinality for d in self.children)
+        """
+        Number of descendant nodes
+        """
+        total = 0
+        stack = list(self.children)
+        while stack:
+            node = stack.pop()
+            total += 1
+            stack.extend(node.children)
+        return total
 
     @property
     def coordinate(self):
-        col = get_column_letter(self.abs_pos[1])
         if self.is_root:
             return "N/A"
-        return f"{col}{self.abs_pos[0]}"
+        row, col = self.abs_pos
+        return f"{get_column_letter(col)}{row}"
 
     def clear_caches(self):
-        if hasattr(self, "abs_pos"):
-            del self.abs_pos
-
-        if hasattr(self, "column_pos"):
-            del self.column_pos
+        for name in self._cached_properties:
+            delattr(self, name)
 
-    def add_child(self, child: Self):
-        self.children.append(child)
-        child.parent = self
+    def _clear_subtree_caches(self):
+        node = self
+        while node is not None:
+            for name in node._subtree_properties:
+                delattr(node, name)
+            node = node.parent
 
-    def get_path(self):
-        path: List[Self] = []
+    def _update_rightmost(self):
         node = self
         while node is not None:
-            path.append(node)
+            rightmost = node.children[-1]._rightmost if node.children else node
+            # Ancestors are up to date as well
+            if node._rightmost is rightmost:
+                break
+            node._rightmost = rightmost
             node = node.parent
-        return list(reversed(path))
 
-    def get_leaves(self):
-        return self._get_leaves([])
+    def add_child(self, child: Self):
+        child._child_index = len(self.children)
+        self.children.append(child)
+        child.parent = self
+        self._update_rightmost()
+        self._clear_subtree_caches()
+
+    def remove_child(self, child: Self):
+        del self.children[child._child_index]
+        for idx in range(child._child_index, len(self.children)):
+            self.children[idx]._child_index = idx
+        child._child_index = -1
+        child.parent = None
+        self._update_rightmost()
+        self._clear_subtree_caches()
 
-    def _get_leaves(self, leaves: List[Self]):
-        if self.is_leaf:
-            return leaves + [self]
-        else:
-            for child in self.children:
-                leaves = child._get_leaves(leaves)
+    def get_path(self):
+        return list(self.path_from_root)
+
+    def get_leaves(self) -> List[Self]:
+        leaves: List[Self] = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                stack.extend(reversed(node.children))
+            else:
+                leaves.append(node)
         return leaves
 
     def __iter__(self) -> Generator[Self, Any, None]:
-        yield self
-        for d in chain(*map(iter, self.children)):
-            yield d
+        """
+        Depth first, root to leaf, left to right
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
 
     def __repr__(self) -> str:
         return str(PrettyFormatter(self))
@@ -286,14 +371,24 @@ class MapperNode:
 
 
 def read_classdef(cls: type, parent: MapperNode):
-    for key, attr in cls.__dict__.items():
-        if key.startswith("__"):
-            continue
+    from_config = MapperNode.from_config
+
+    # Worklist instead of recursion, nesting depth is not limited by the stack.
+    # Children keep declaration order: all attributes of a class are read
+    # before the next class is taken from the stack
+    stack = [(cls, parent)]
+    while stack:
+        klass, node = stack.pop()
+        for key, attr in klass.__dict__.items():
+            # Skip dunders (slice is cheaper than startswith)
+            if key[:2] == "__":
+                continue
 
-        if isinstance(attr, type):
-            node = MapperNode.from_config(attr)
-            parent.add_child(node)
-            read_classdef(attr, node)
+            # Exact type check first, metaclasses are rare in mapper definitions
+            if type(attr) is type or isinstance(attr, type):
+                child = from_config(attr)
+                node.add_child(child)
+                stack.append((attr, child))
 
 
 class SpreadsheetParserMeta(type):
@@ -319,35 +414,60 @@ class SpreadsheetMapper(metaclass=SpreadsheetParserMeta):
         self.root = node
         return self
 
-    def map_rows(self, ws: Worksheet, start_at: int):
+    def map_rows(
+        self,
+        ws: Worksheet,
+        start_at: int,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Map every row starting at `start_at` until the first blank one
+        :param progress: called with the number of mapped rows every 1000 rows
+        """
         self._verify_augment(ws)
 
         nodes = self.root.get_leaves()
 
-        row_index = start_at
-        while True:
+        # Per-leaf invariants, computed once for all rows. Leaves come in
+        # depth first order, so siblings are grouped under their shared
+        # parent path: (names of the enclosing dicts, [(column index, key)])
+        # Rows are read only within the mapped columns, indices are relative
+        min_col = min(d.column_pos for d in nodes)
+        max_col = max(d.column_pos for d in nodes)
+        leaf_groups: List[Tuple[Tuple[str, ...], List[Tuple[int, str]]]] = []
+        for node in nodes:
+            path = node.output_path
+            parents, key = path[:-1], path[-1]
+            if not leaf_groups or leaf_groups[-1][0] != parents:
+                leaf_groups.append((parents, []))
+            leaf_groups[-1][1].append((node.column_pos - min_col, key))
+        first_index = nodes[0].column_pos - min_col
+
+        # Local names are cheaper to resolve in the row loop
+        _normalize = normalize
+
+        rows = ws.iter_rows(
+            min_row=start_at, min_col=min_col, max_col=max_col, values_only=True
+        )
+        for row_count, row in enumerate(rows, start=1):
+            # Stop on first blank row (cell)
+            if _normalize(row[first_index]) is None:
+                break
+
             # Receiving obj
             obj = {}
 
-            for col_idx, node in enumerate(nodes):
-                cell = ws.cell(row_index, node.column_pos)
-                value = normalize(cell.value)
-
-                # Stop on first blank row (cell)
-                if col_idx == 0:
-                    if value is None:
-                        print("Finished")
-                        return
-
-                str_path = list(
-                    map(lambda d: d.config.output_name, node.get_path()[1:])
-                )
-                dict_path_set(obj, str_path, value)
+            for parents, leaves in leaf_groups:
+                target = obj
+                for name in parents:
+                    target = target.setdefault(name, {})
+                for col_index, key in leaves:
+                    target[key] = _normalize(row[col_index])
 
             yield obj
-            sys.stdout.write(".")
 
-            row_index += 1
+            if progress is not None and row_count % 1000 == 0:
+                progress(row_count)
 
     def _verify_augment(self: Self, ws: Worksheet):
         """
@@ -359,6 +479,13 @@ class SpreadsheetMapper(metaclass=SpreadsheetParserMeta):
         # If set, node would drop any caches
         clear_caches_flag = False
 
+        # Read the whole header in a single pass. Positions only move left
+        # when optional nodes are dropped, so this covers every lookup below
+        positions = [node.abs_pos for node in tree if not node.is_root]
+        max_row = max((d[0] for d in positions), default=1)
+        max_col = max((d[1] for d in positions), default=1)
+        header = read_values(ws, max_row=max_row, max_col=max_col)
+
         # Access from root to leaf, depth first
         for node in tree:
             if node.is_root:
@@ -367,18 +494,16 @@ class SpreadsheetMapper(metaclass=SpreadsheetParserMeta):
             if clear_caches_flag:
                 node.clear_caches()
 
-            cell = ws.cell(*node.abs_pos)
-            # Checl cell name actually matches name in the config
+            row_pos, col_pos = node.abs_pos
+            value = header[row_pos - 1][col_pos - 1]
 
-            if (expected := node.config.input_name) != (
-                actual := normalize(unwrap(cell).value)
-            ):
+            # Checl cell name actually matches name in the config
+            if (expected := node.config.input_name) != (actual := normalize(value)):
                 # Optional nodes might be skipped
                 if node.config.optional:
                     # Effectively remove node from the tree
                     if node.parent is not None:
-                        node.parent.children.remove(node)
-                        node.parent = None
+                        node.parent.remove_child(node)
                         clear_caches_flag = True
                         continue
 
@@ -399,13 +524,7 @@ def collapse_levels(levels: List[str]) -> List[str]:
     """
     Remove duplicate levels
     """
-    collapsed = []
-    for level in levels:
-        head = collapsed[-1] if len(collapsed) > 0 else None
-        if head != level:
-            collapsed.append(level)
-
-    return collapsed
+    return [level for level, _ in groupby(levels)]
 
 
 def read_header(
@@ -414,32 +533,32 @@ def read_header(
     width: int | Literal["auto"] | None = None,
     offset: Tuple[int, int] = (0, 0),
 ):
+    # Header cells are usually merged, read-only worksheets can't tell which
+    if getattr(ws, "merged_cells", None) is None:
+        raise TypeError(
+            "Header inference needs merged cell ranges, "
+            "open the workbook without read_only=True"
+        )
+
     if width is None:
         width = "auto"
 
-    col_index = 1
-
-    while True:
-        levels = []
-        for level in range(1, height + 1):
-            cell = unwrap(ws.cell(level + offset[0], col_index + offset[1]))
-            value = normalize(cell.value)
-            if value is None:
-                continue
-            levels.append(value)
+    # Read the whole header at once
+    max_col = ws.max_column if width == "auto" else width + offset[1]
+    rows = read_values(
+        ws,
+        max_row=height + offset[0],
+        max_col=max_col,
+        min_row=1 + offset[0],
+        min_col=1 + offset[1],
+    )
 
-        # Remove duplicates
+    # Walk the header column by column
+    for column in zip(*rows):
+        levels = [d for d in map(normalize, column) if d is not None]
         levels = collapse_levels(levels)
         yield levels
 
-        # Next cell
-        col_index += 1
-
-        # Done on max width reached
-        if width != "auto":
-            if col_index > width:
-                break
-
         # Done on no data
         if len(levels) == 0:
             break
@@ -457,6 +576,13 @@ def merge(reciever: MapperNode, other: MapperNode) -> Tuple[MapperNode | None, i
         reciever.add_child(other)
         return None, 0
 
+    # Header levels below a leaf can't be placed
+    if len(reciever.children) == 0:
+        raise ValueError(
+            f"Header '{other.config.input_name}' is nested under "
+            f"'{reciever.config.input_name}', which was already read as a leaf"
+        )
+
     # The last node which was merged
     first_divergent = other
     last_child = reciever.children[-1]
@@ -1,9 +1,72 @@
 import re
+import string
+from functools import lru_cache
 
 from openpyxl.cell import Cell, MergedCell
 from openpyxl.styles.styleable import StyleableObject
 from openpyxl.worksheet.worksheet import Worksheet
-from typing import Any, List, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+
+class cached_property:
+    """
+    Minimal `functools.cached_property`: computes the value once and stores
+    it in the `_<name>` attribute, so it also works with `__slots__` classes
+    (which have to declare that slot). `del obj.<name>` drops the value.
+    No locking, nodes are built and read from a single thread.
+    Unlike `functools.cached_property` every read goes through `__get__`
+    """
+
+    def __init__(self, fn: Callable[[Any], Any]):
+        self.fn = fn
+        self.attr = f"_{fn.__name__}"
+        self.__doc__ = fn.__doc__
+
+    def __set_name__(self, owner: type, name: str):
+        self.attr = f"_{name}"
+
+    def __get__(self, obj: Any, cls: Optional[type] = None):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.attr)
+        except AttributeError:
+            value = self.fn(obj)
+            setattr(obj, self.attr, value)
+            return value
+
+    def __delete__(self, obj: Any):
+        try:
+            delattr(obj, self.attr)
+        except AttributeError:
+            pass
+
+
+def _merged_map(sheet: Worksheet) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    (row, col) of every merged cell -> (row, col) of its range anchor.
+    Cached on the sheet, rebuilt when the set of merged ranges changes
+    """
+    ranges = sheet.merged_cells.ranges
+    # CellRange hashes on its bounds
+    key = frozenset(ranges)
+    cached = getattr(sheet, "_pyxl_merged", None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    merged = {pos: (rng.min_row, rng.min_col) for rng in ranges for pos in rng.cells}
+    setattr(sheet, "_pyxl_merged", (key, merged))
+    return merged
 
 
 def unwrap(cell: Union[Cell, MergedCell, StyleableObject]):
@@ -15,20 +78,65 @@ def unwrap(cell: Union[Cell, MergedCell, StyleableObject]):
         case Cell():
             return cell
         case MergedCell():
-            rng = [s for s in sheet.merged_cells.ranges if cell.coordinate in s]
-            return sheet.cell(rng[0].min_row, rng[0].min_col)
+            anchor = _merged_map(sheet).get((cell.row, cell.column))
+            if anchor is None:
+                return cell
+            return sheet.cell(*anchor)
         case _:
             raise TypeError(f"Unknown and unsupported cell type {type(cell)}")
 
 
+def read_values(
+    ws: Worksheet, max_row: int, max_col: int, min_row: int = 1, min_col: int = 1
+) -> List[List[Any]]:
+    """
+    Read a rectangle of cell values in a single pass.
+    Merged cells get the value of the top-left cell of their range
+    """
+    values = [
+        list(row)
+        for row in ws.iter_rows(
+            min_row=min_row,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+            values_only=True,
+        )
+    ]
+
+    # Read-only worksheets do not know about merged cells
+    merged_cells = getattr(ws, "merged_cells", None)
+    if merged_cells is None:
+        return values
+
+    for rng in merged_cells.ranges:
+        # Skip ranges outside of the rectangle
+        if rng.max_row < min_row or rng.min_row > max_row:
+            continue
+        if rng.max_col < min_col or rng.min_col > max_col:
+            continue
+
+        value = ws.cell(rng.min_row, rng.min_col).value
+        for row in range(max(rng.min_row, min_row), min(rng.max_row, max_row) + 1):
+            for col in range(max(rng.min_col, min_col), min(rng.max_col, max_col) + 1):
+                values[row - min_row][col - min_col] = value
+
+    return values
+
+
 def normalize(value: Any):
     """
     Remove unnecessary garbage from the string
     """
-    # TODO switch
-    if type(value) == str:
-        return value.replace("\n", " ").strip()
-    if type(value) == float:
+    # Blank and integer cells are the most common, skip the checks below
+    if value is None or value.__class__ is int:
+        return value
+    if isinstance(value, str):
+        # Most cells are single line, avoid building an intermediate string
+        if "\n" in value:
+            return value.replace("\n", " ").strip()
+        return value.strip()
+    if isinstance(value, float):
         return str(value)
     return value
 
@@ -60,11 +168,15 @@ def stringify_int(num: str):
     return numbers[int(head)] + rest
 
 
+word_re = re.compile(r"(\d+|\w+)")
+digits_re = re.compile(r"\d+")
+
+
+@lru_cache(maxsize=4096)
 def class_name_from_str(value: str) -> str:
-    word_re = re.compile(r"(\d+|\w+)")
-    matches = re.findall(word_re, value)
+    matches = word_re.findall(value)
     head, rest = matches[0], matches[1:]
-    if re.match(r"\d+", head):
+    if digits_re.match(head):
         override_head = stringify_int(head)
     else:
         override_head = None
@@ -73,18 +185,33 @@ def class_name_from_str(value: str) -> str:
     return "".join([capfirst(d) for d in pieces])
 
 
-camel_re = re.compile("((?<=[a-z0-9])[A-Z]|(?!^)[A-Z](?=[a-z]))")
+uppercase = frozenset(string.ascii_uppercase)
+lowercase = frozenset(string.ascii_lowercase)
+lowercase_digits = lowercase | frozenset(string.digits)
 
 
+@lru_cache(maxsize=4096)
 def camel_to_snake(value: str) -> str:
-    return camel_re.sub(r"_\1", value).lower()
-
-
-def dict_path_set(receiver: dict, path: List[str], value: Any):
+    """
+    Put "_" before an uppercase letter that follows a lowercase letter or
+    a digit, or that starts a capitalized word (RGBValue -> rgb_value)
+    """
+    pieces = []
+    last = len(value) - 1
+    for idx, char in enumerate(value):
+        if idx > 0 and char in uppercase:
+            if value[idx - 1] in lowercase_digits or (
+                idx < last and value[idx + 1] in lowercase
+            ):
+                pieces.append("_")
+        pieces.append(char)
+    return "".join(pieces).lower()
+
+
+def dict_path_set(receiver: dict, path: Sequence[str], value: Any):
     obj = receiver
-    for path_item in path[:-1]:
-        if not path_item in obj:
-            obj[path_item] = {}
-        obj = obj[path_item]
+    # Index instead of slicing path[:-1], no temporary copy of the path
+    for idx in range(len(path) - 1):
+        obj = obj.setdefault(path[idx], {})
 
     obj[path[-1]] = value
@@ -6,7 +6,7 @@ from pyxlmapper.formatters import (
     MapperFormatter,
     TypescriptFormatter,
 )
-from pyxlmapper.mapper import SpreadsheetMapper
+from pyxlmapper.mapper import InternalConfig, MapperNode, SpreadsheetMapper
 
 
 # The most basic mapper
@@ -192,3 +192,30 @@ def test_ts_formatter(mapper, lines):
     actual = code.split("\n")[2:-1]
     print(code)
     assert actual == lines
+
+
+def test_ts_formatter_repeated_sibling_names():
+    root = MapperNode(config=InternalConfig(raw_name="Mapper", offset=(0, 0)))
+    for group, child in (("A", "X"), ("B", "Y"), ("A", "Z")):
+        node = MapperNode(config=InternalConfig.from_input_name(group))
+        node.add_child(MapperNode(config=InternalConfig.from_input_name(child)))
+        root.add_child(node)
+
+    code = str(TypescriptFormatter(root))
+    assert "export type A = {\n  x: string;\n}" in code
+    assert "export type MapperA = {\n  z: string;\n}" in code
+    assert "  a: A;\n  b: B;\n  a: MapperA;\n" in code
+
+
+def test_ts_formatter_repeated_prefixed_names():
+    root = MapperNode(config=InternalConfig(raw_name="Mapper", offset=(0, 0)))
+    for group in ("A", "B", "A", "B", "A"):
+        node = MapperNode(config=InternalConfig.from_input_name(group))
+        node.add_child(MapperNode(config=InternalConfig.from_input_name("X")))
+        root.add_child(node)
+
+    code = str(TypescriptFormatter(root))
+    typenames = [d.split(" ")[2] for d in code.split("\n") if d.startswith("export")]
+    assert sorted(typenames) == sorted(
+        ["A", "B", "MapperA", "MapperB", "MapperA1", "Mapper"]
+    )
@@ -0,0 +1,175 @@
+import openpyxl
+import pytest
+
+from pyxlmapper.formatters import FlatFormatter
+from pyxlmapper.mapper import (
+    InternalConfig,
+    MapperNode,
+    SpreadsheetMapper,
+    infer,
+    merge,
+)
+
+
+class CategoryMapper(SpreadsheetMapper):
+    class Category:
+        class A:
+            pass
+
+        class B:
+            pass
+
+    class LoneField:
+        input_name = "Lone Field"
+
+
+EXPECTED_ROWS = [
+    {"category": {"a": "a3", "b": "3.5"}, "lone_field": 3},
+    {"category": {"a": "a4", "b": "4.5"}, "lone_field": 4},
+    {"category": {"a": "a5", "b": "5.5"}, "lone_field": 5},
+]
+
+
+@pytest.fixture
+def workbook():
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws["A1"] = "Category"
+    ws.merge_cells("A1:B1")
+    ws["C1"] = "Lone Field"
+    ws.merge_cells("C1:C2")
+    ws["A2"] = "A"
+    ws["B2"] = "B"
+    for row in range(3, 6):
+        ws.cell(row, 1, f"a{row}")
+        ws.cell(row, 2, row + 0.5)
+        ws.cell(row, 3, row)
+    return wb
+
+
+def test_map_rows(workbook):
+    rows = list(CategoryMapper().map_rows(workbook.active, start_at=3))
+    assert rows == EXPECTED_ROWS
+
+
+def test_map_rows_read_only(workbook, tmp_path):
+    path = tmp_path / "data.xlsx"
+    workbook.save(path)
+    wb = openpyxl.open(path, read_only=True, data_only=True)
+    rows = list(CategoryMapper().map_rows(wb.active, start_at=3))
+    assert rows == EXPECTED_ROWS
+
+
+def test_subtree_caches_follow_add_child():
+    root = CategoryMapper().root
+    category = root.children[0]
+    assert root.cardinality == 4
+    assert root.last is root.children[-1]
+
+    extra = MapperNode(config=InternalConfig.from_input_name("Extra"))
+    category.add_child(extra)
+    assert root.cardinality == 5
+    assert category.last is extra
+
+    category.remove_child(extra)
+    assert root.cardinality == 4
+    assert category.last is category.children[-1]
+
+
+def test_column_pos_with_identical_siblings():
+    root = MapperNode(config=InternalConfig(raw_name="Root", offset=(0, 0)))
+    for _ in range(3):
+        root.add_child(MapperNode(config=InternalConfig.from_input_name("Same")))
+    assert [d.column_pos for d in root.children] == [1, 2, 3]
+
+
+def test_merge_under_leaf():
+    root = MapperNode(config=InternalConfig(raw_name="Root", offset=(0, 0)))
+    leaf = MapperNode(config=InternalConfig.from_input_name("Leaf"))
+    root.add_child(leaf)
+    other = MapperNode(config=InternalConfig.from_input_name("Below"))
+    with pytest.raises(ValueError, match="already read as a leaf"):
+        merge(leaf, other)
+
+
+def test_infer(workbook):
+    mapper = infer(workbook.active, height=2, name="Inferred")
+    assert str(FlatFormatter(mapper.root)).split("\n") == [
+        "A2 -> category.a",
+        "B2 -> category.b",
+        "C1 -> lone_field",
+    ]
+
+
+def test_infer_read_only(workbook, tmp_path):
+    path = tmp_path / "data.xlsx"
+    workbook.save(path)
+    wb = openpyxl.open(path, read_only=True)
+    with pytest.raises(TypeError, match="read_only"):
+        infer(wb.active, height=2, name="Inferred")
+
+
+def test_config_from_class_attributes():
+    class Base:
+        offset = (0, 1)
+
+    class SomeField(Base):
+        optional = True
+
+    config = InternalConfig.from_config(SomeField)
+    assert config.input_name == "SomeField"
+    assert config.output_name == "some_field"
+    assert config.offset == (0, 1)
+    assert config.optional is True
+    assert config.skip is False
+    assert config._overrides == {"offset", "optional"}
+
+
+def test_map_rows_progress(workbook):
+    ws = workbook.active
+    for row in range(6, 2503):
+        ws.cell(row, 1, "a")
+    reported = []
+    rows = list(CategoryMapper().map_rows(ws, start_at=3, progress=reported.append))
+    assert len(rows) == 2500
+    assert reported == [1000, 2000]
+
+
+class ShiftedMapper(SpreadsheetMapper):
+    offset = (0, 1)
+
+    class First:
+        pass
+
+    class Second:
+        pass
+
+
+@pytest.mark.parametrize("read_only", (False, True))
+def test_map_rows_shifted(tmp_path, read_only):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["ignored", "First", "Second"])
+    ws.append(["x", 1, 2])
+    ws.append(["y", 3, 4])
+    path = tmp_path / "shifted.xlsx"
+    wb.save(path)
+
+    ws = openpyxl.open(path, read_only=read_only).active
+    rows = list(ShiftedMapper().map_rows(ws, start_at=2))
+    assert rows == [{"first": 1, "second": 2}, {"first": 3, "second": 4}]
+
+
+class YearMapper(SpreadsheetMapper):
+    class Year:
+        input_name = 2023
+        output_name = "y2023"
+
+
+def test_map_rows_numeric_input_name():
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append([2023])
+    ws.append(["v"])
+    assert YearMapper().root.children[0].config.input_name == 2023
+    assert list(YearMapper().map_rows(ws, start_at=2)) == [{"y2023": "v"}]
@@ -1,10 +1,14 @@
+import openpyxl
 import pytest
 
 from pyxlmapper.util import (
+    cached_property,
     class_name_from_str,
     camel_to_snake,
     normalize,
     dict_path_set,
+    read_values,
+    unwrap,
 )
 
 
@@ -40,6 +44,9 @@ def test_camel_to_snake(value, expected):
 def test_normalize():
     assert normalize(4) == 4
     assert normalize(" a b\nc ") == "a b c"
+    assert normalize("a\tb ") == "a\tb"
+    assert normalize(None) is None
+    assert normalize(1.5) == "1.5"
 
 
 def test_dict_path_set_single():
@@ -58,3 +65,53 @@ def test_dict_path_set_merging():
     obj = {"a": {"b": {"d": 2}}}
     dict_path_set(obj, ["a", "b", "c"], 1)
     assert obj == {"a": {"b": {"c": 1, "d": 2}}}
+
+
+def test_read_values_merged():
+    ws = openpyxl.Workbook().active
+    ws["A1"] = "a"
+    ws.merge_cells("A1:B2")
+    ws["C1"] = "c"
+    ws["C2"] = 2
+    assert read_values(ws, max_row=2, max_col=3) == [["a", "a", "c"], ["a", "a", 2]]
+    assert read_values(ws, max_row=2, max_col=3, min_row=2, min_col=2) == [["a", 2]]
+
+
+def test_cached_property():
+    class Counter:
+        calls = 0
+
+        @cached_property
+        def value(self):
+            self.calls += 1
+            return self.calls
+
+    counter = Counter()
+    assert counter.value == 1
+    assert counter.value == 1
+    del counter.value
+    assert counter.value == 2
+
+
+def test_unwrap_merged():
+    ws = openpyxl.Workbook().active
+    ws["B2"] = "b"
+    ws.merge_cells("B2:C3")
+    assert unwrap(ws["C3"]) is ws["B2"]
+    assert unwrap(ws["B2"]) is ws["B2"]
+
+    ws["E1"] = "e"
+    ws.merge_cells("E1:F1")
+    assert unwrap(ws["F1"]) is ws["E1"]
+
+    # Same number of ranges, different cells
+    ws.unmerge_cells("E1:F1")
+    ws["H1"] = "h"
+    ws.merge_cells("H1:I1")
+    assert unwrap(ws["I1"]) is ws["H1"]
+
+
+def test_dict_path_set_tuple():
+    obj = {"a": {"d": 2}}
+    dict_path_set(obj, ("a", "b"), 1)
+    assert obj == {"a": {"b": 1, "d": 2}}